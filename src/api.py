@@ -2,8 +2,14 @@ from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import pandas as pd
 import joblib
+import hashlib
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+from src.audit import audit_log_from_env
+from src.drift import DriftMonitor
+
 # -----------------------------
 # Paramètres
 # -----------------------------
@@ -14,6 +20,7 @@ PROJECT_DIR = BASE_DIR.parent
 
 MODEL_PATH = PROJECT_DIR / "models" / "modele_pipeline.pkl"
 DATA_PATH = PROJECT_DIR / "data" / "train_df_sample.csv"
+AUDIT_DIR = PROJECT_DIR / "logs" / "audit"
 
 # -----------------------------
 # Vérifications fichiers
@@ -29,6 +36,9 @@ if not DATA_PATH.exists():
 # -----------------------------
 pipe = joblib.load(MODEL_PATH)
 
+# Empreinte du modèle, tracée dans chaque entrée du journal d'audit
+MODEL_FINGERPRINT = hashlib.sha256(MODEL_PATH.read_bytes()).hexdigest()
+
 df_clients = pd.read_csv(DATA_PATH)
 
 if "SK_ID_CURR" not in df_clients.columns:
@@ -38,13 +48,40 @@ df_clients.set_index("SK_ID_CURR", inplace=True)
 
 ALL_COLUMNS = pipe.feature_names_in_
 
+# -----------------------------
+# Journal d'audit
+# -----------------------------
+audit_log = audit_log_from_env(AUDIT_DIR)
+
+# -----------------------------
+# Surveillance de la dérive
+# -----------------------------
+# Profil de référence calculé une seule fois sur la population de validation
+# Seules les variables vues par le modèle peuvent influer sur le score
+DRIFT_FEATURES = [col for col in df_clients.columns if col in ALL_COLUMNS]
+DRIFT_MATRIX = df_clients[DRIFT_FEATURES].to_numpy(dtype=float)
+
+reference_scores = pipe.predict_proba(
+    df_clients.reindex(columns=ALL_COLUMNS, fill_value=0.0)
+)[:, 1]
+
+drift_monitor = DriftMonitor(DRIFT_MATRIX, DRIFT_FEATURES, reference_scores)
+
 # -----------------------------
 # FastAPI
 # -----------------------------
+@asynccontextmanager
+async def lifespan(app):
+    audit_log.start()
+    yield
+    # close() attend le thread d'écriture : hors de la boucle d'événements
+    await asyncio.to_thread(audit_log.close)
+
 app = FastAPI(
     title="API Scoring Crédit P7",
     version="1.1",
-    description="API de prédiction de risque crédit à partir de SK_ID_CURR"
+    description="API de prédiction de risque crédit à partir de SK_ID_CURR",
+    lifespan=lifespan
 )
 
 class ClientRequest(BaseModel):
@@ -62,6 +99,14 @@ def health():
 def get_clients():
     return {"clients": df_clients.index.tolist()}
 
+@app.get("/audit/stats")
+def audit_stats():
+    return audit_log.stats()
+
+@app.get("/drift")
+def drift():
+    return drift_monitor.report()
+
 @app.post("/predict")
 def predict(request: ClientRequest):
     client_id = request.SK_ID_CURR
@@ -82,6 +127,9 @@ def predict(request: ClientRequest):
     proba = float(pipe.predict_proba(df_input)[0][1])
     prediction = "Refusé" if proba > THRESHOLD_METIER else "Approuvé"
 
+    audit_log.record(client_id, proba, THRESHOLD_METIER, prediction, MODEL_FINGERPRINT)
+    drift_monitor.update(DRIFT_MATRIX[df_clients.index.get_loc(client_id)], proba)
+
     return {
         "client_id": int(client_id),
         "score_probabilite": round(proba, 4),
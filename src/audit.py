@@ -0,0 +1,363 @@
+"""
+Journal d'audit asynchrone des décisions de l'API.
+
+Chaque décision de `/predict` est déposée dans un tampon circulaire en
+mémoire (aucune E/S dans le handler). Un thread d'écriture vide le tampon
+par lots dans des fichiers JSON Lines en ajout seul, avec rotation par
+taille et une politique de fsync configurable.
+
+À côté de chaque fichier `decisions-*.jsonl`, un index `*.idx` décrit
+chaque lot écrit (offset, longueur, bornes temporelles, clients) : les
+requêtes par client ou par plage de temps ne lisent que les lots utiles.
+
+Utilisation en ligne de commande :
+    python -m src.audit --client 100002
+    python -m src.audit --since 2026-01-01T00:00:00 --until 2026-01-02T00:00:00
+"""
+import argparse
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+# -----------------------------
+# Paramètres
+# -----------------------------
+FSYNC_POLICIES = ("always", "interval", "never")
+
+LOG_PREFIX = "decisions-"
+LOG_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx"
+
+
+class AuditLog:
+    """Tampon circulaire + thread d'écriture des décisions."""
+
+    def __init__(
+        self,
+        directory,
+        buffer_size=10_000,
+        batch_size=256,
+        flush_interval=1.0,
+        max_bytes=64 * 1024 * 1024,
+        fsync="interval",
+        fsync_interval=5.0,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Politique fsync inconnue : {fsync!r} (attendu : {', '.join(FSYNC_POLICIES)})"
+            )
+
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+
+        # Le deque borné écrase les entrées les plus anciennes quand il est plein
+        self._buffer = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._atexit_registered = False
+
+        self._log_file = None
+        self._index_file = None
+        self._last_fsync = 0.0
+
+        self._stats = {
+            "recorded": 0,
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "rotations": 0,
+            "buffer_high_watermark": 0,
+            "write_errors": 0,
+            "close_timeouts": 0,
+        }
+
+    # -----------------------------
+    # Côté requête (non bloquant)
+    # -----------------------------
+    def record(self, client_id, score, threshold, prediction, model_fingerprint):
+        """Ajoute une décision au tampon. Ne fait aucune E/S."""
+        ts = time.time()
+        entry = {
+            "ts": ts,
+            "timestamp": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(),
+            "client_id": int(client_id),
+            "score": score,
+            "threshold": threshold,
+            "prediction": prediction,
+            "model_fingerprint": model_fingerprint,
+        }
+
+        with self._cond:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._stats["dropped"] += 1
+            self._buffer.append(entry)
+            self._stats["recorded"] += 1
+
+            size = len(self._buffer)
+            if size > self._stats["buffer_high_watermark"]:
+                self._stats["buffer_high_watermark"] = size
+            if size >= self.batch_size:
+                self._cond.notify()
+
+    def stats(self):
+        """Compteurs du journal, dont les indicateurs de saturation du tampon."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["buffer_size"] = len(self._buffer)
+        stats["buffer_capacity"] = self._buffer.maxlen
+        stats["buffer_fill_ratio"] = round(stats["buffer_size"] / stats["buffer_capacity"], 4)
+        stats["running"] = self._thread is not None and self._thread.is_alive()
+        return stats
+
+    # -----------------------------
+    # Cycle de vie
+    # -----------------------------
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.close)
+            self._atexit_registered = True
+
+    def close(self, timeout=10.0):
+        """Vide le tampon, synchronise les fichiers et arrête le thread."""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Le thread détient encore les fichiers : on ne le considère pas arrêté
+            with self._cond:
+                self._stats["close_timeouts"] += 1
+            return
+        self._thread = None
+
+        # Thread arrêté : ce qui reste dans le tampon ne sera jamais écrit
+        with self._cond:
+            self._stats["dropped"] += len(self._buffer)
+            self._buffer.clear()
+
+    # -----------------------------
+    # Thread d'écriture
+    # -----------------------------
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    if len(self._buffer) < self.batch_size and not self._stopping:
+                        self._cond.wait(self.flush_interval)
+                    batch = list(self._buffer)
+                    self._buffer.clear()
+                    stopping = self._stopping
+
+                try:
+                    if batch:
+                        self._write_batch(batch)
+                    elif self.fsync == "interval":
+                        self._maybe_fsync()
+                except Exception:
+                    # Une erreur ne doit pas arrêter le thread : le lot est perdu,
+                    # le lot suivant repart sur un nouveau fichier
+                    with self._cond:
+                        self._stats["write_errors"] += 1
+                        self._stats["dropped"] += len(batch)
+                    self._close_files()
+
+                if stopping:
+                    break
+        finally:
+            self._close_files()
+
+    def _write_batch(self, batch):
+        if self._log_file is None or self._log_file.tell() >= self.max_bytes:
+            self._rotate()
+
+        payload = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in batch)
+        data = payload.encode("utf-8")
+
+        offset = self._log_file.tell()
+        self._log_file.write(data)
+        self._log_file.flush()
+
+        # L'index est écrit après les données : il ne pointe jamais au-delà du fichier
+        block = {
+            "offset": offset,
+            "length": len(data),
+            "count": len(batch),
+            "ts_min": min(entry["ts"] for entry in batch),
+            "ts_max": max(entry["ts"] for entry in batch),
+            "clients": sorted({entry["client_id"] for entry in batch}),
+        }
+        self._index_file.write((json.dumps(block) + "\n").encode("utf-8"))
+        self._index_file.flush()
+
+        if self.fsync == "always":
+            self._fsync()
+        elif self.fsync == "interval":
+            self._maybe_fsync()
+
+        with self._cond:
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+
+    def _rotate(self):
+        self._close_files()
+
+        name = f"{LOG_PREFIX}{time.time_ns()}"
+        log_file = open(self.directory / f"{name}{LOG_SUFFIX}", "ab")
+        try:
+            index_file = open(self.directory / f"{name}{INDEX_SUFFIX}", "ab")
+        except OSError:
+            log_file.close()
+            raise
+        self._log_file = log_file
+        self._index_file = index_file
+
+        with self._cond:
+            self._stats["rotations"] += 1
+
+    def _fsync(self):
+        for f in (self._log_file, self._index_file):
+            if f is not None:
+                os.fsync(f.fileno())
+        self._last_fsync = time.monotonic()
+
+    def _maybe_fsync(self):
+        if time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self._fsync()
+
+    def _close_files(self):
+        files = (self._log_file, self._index_file)
+        self._log_file = None
+        self._index_file = None
+
+        for f in files:
+            if f is None:
+                continue
+            try:
+                if self.fsync != "never":
+                    f.flush()
+                    os.fsync(f.fileno())
+                f.close()
+            except (OSError, ValueError):
+                with self._cond:
+                    self._stats["write_errors"] += 1
+
+
+def audit_log_from_env(default_directory):
+    """Construit un AuditLog à partir des variables d'environnement AUDIT_*."""
+    return AuditLog(
+        directory=os.environ.get("AUDIT_DIR", default_directory),
+        buffer_size=int(os.environ.get("AUDIT_BUFFER_SIZE", 10_000)),
+        batch_size=int(os.environ.get("AUDIT_BATCH_SIZE", 256)),
+        flush_interval=float(os.environ.get("AUDIT_FLUSH_INTERVAL", 1.0)),
+        max_bytes=int(os.environ.get("AUDIT_MAX_BYTES", 64 * 1024 * 1024)),
+        fsync=os.environ.get("AUDIT_FSYNC", "interval"),
+        fsync_interval=float(os.environ.get("AUDIT_FSYNC_INTERVAL", 5.0)),
+    )
+
+
+# -----------------------------
+# Consultation des journaux
+# -----------------------------
+def query(directory, client_id=None, since=None, until=None):
+    """
+    Parcourt les journaux d'audit et renvoie les décisions filtrées.
+    `since` et `until` sont des timestamps epoch (secondes), bornes incluses.
+    Seuls les lots dont l'index correspond sont relus depuis le disque.
+    """
+    directory = Path(directory)
+    results = []
+
+    for log_path in sorted(directory.glob(f"{LOG_PREFIX}*{LOG_SUFFIX}")):
+        index_path = log_path.with_suffix(INDEX_SUFFIX)
+
+        if not index_path.exists():
+            # Pas d'index (arrêt brutal avant écriture) : lecture complète
+            with open(log_path, "rb") as f:
+                results.extend(_filter(f.read(), client_id, since, until))
+            continue
+
+        with open(index_path, "rb") as idx, open(log_path, "rb") as f:
+            # Fin de la zone couverte par l'index
+            end = 0
+            for line in idx:
+                try:
+                    block = json.loads(line)
+                except ValueError:
+                    # Ligne d'index tronquée en fin de fichier
+                    break
+                end = max(end, block["offset"] + block["length"])
+                if since is not None and block["ts_max"] < since:
+                    continue
+                if until is not None and block["ts_min"] > until:
+                    continue
+                if client_id is not None and client_id not in block["clients"]:
+                    continue
+                f.seek(block["offset"])
+                results.extend(_filter(f.read(block["length"]), client_id, since, until))
+
+            # Données écrites mais non indexées (arrêt brutal entre les deux écritures)
+            f.seek(end)
+            results.extend(_filter(f.read(), client_id, since, until))
+
+    return results
+
+
+def _filter(data, client_id, since, until):
+    for line in data.splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if client_id is not None and entry["client_id"] != client_id:
+            continue
+        if since is not None and entry["ts"] < since:
+            continue
+        if until is not None and entry["ts"] > until:
+            continue
+        yield entry
+
+
+def _parse_time(value):
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultation du journal d'audit des décisions.")
+    parser.add_argument(
+        "--dir",
+        default=os.environ.get("AUDIT_DIR", Path(__file__).resolve().parent.parent / "logs" / "audit"),
+        help="Répertoire des journaux (défaut : $AUDIT_DIR ou logs/audit)",
+    )
+    parser.add_argument("--client", type=int, help="SK_ID_CURR à rechercher")
+    parser.add_argument("--since", type=_parse_time, help="Début (ISO 8601, UTC si sans fuseau)")
+    parser.add_argument("--until", type=_parse_time, help="Fin (ISO 8601, UTC si sans fuseau)")
+    args = parser.parse_args(argv)
+
+    for entry in query(args.dir, client_id=args.client, since=args.since, until=args.until):
+        sys.stdout.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
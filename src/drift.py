@@ -0,0 +1,161 @@
+"""
+Surveillance de la dérive des clients scorés par l'API.
+
+Un profil de référence (histogrammes à bins fixes par variable et du score)
+est calculé une seule fois sur `df_clients`. Chaque requête incrémente
+ensuite les compteurs courants en O(1) par rapport au trafic : aucune
+donnée brute n'est conservée. PSI et KS sont calculés de façon vectorisée
+sur l'ensemble des variables à partir des histogrammes.
+"""
+import threading
+
+import numpy as np
+
+# -----------------------------
+# Paramètres
+# -----------------------------
+N_FEATURE_BINS = 10
+N_SCORE_BINS = 20
+
+# Lissage des proportions nulles dans le calcul du PSI
+PSI_EPSILON = 1e-4
+
+# En dessous, les bins vides font gonfler le PSI : pas de diagnostic
+MIN_OBSERVATIONS = 10 * N_SCORE_BINS
+
+# Seuils usuels d'interprétation du PSI
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+
+class DriftMonitor:
+    """Histogrammes incrémentaux des variables et du score, comparés à une référence."""
+
+    def __init__(self, reference, features, reference_scores, n_bins=N_FEATURE_BINS):
+        """
+        reference : tableau (n_clients, n_features) de la population de référence
+        features : noms des colonnes de `reference`
+        reference_scores : scores du modèle sur la population de référence
+        """
+        reference = np.asarray(reference, dtype=float)
+        self.features = list(features)
+
+        # Bornes internes par quantiles : (n_features, n_bins - 1)
+        quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+        self._edges = np.nanquantile(reference, quantiles, axis=0).T
+        # Colonnes entièrement manquantes : bornes neutres
+        self._edges = np.nan_to_num(self._edges, nan=0.0)
+
+        # Un bin supplémentaire (le dernier) pour les valeurs manquantes
+        self._ref_features = self._proportions(self._bin_matrix(reference))
+
+        self._score_edges = np.linspace(0, 1, N_SCORE_BINS + 1)[1:-1]
+        ref_score_bins = np.searchsorted(self._score_edges, np.asarray(reference_scores, dtype=float), side="right")
+        ref_score_counts = np.bincount(ref_score_bins, minlength=N_SCORE_BINS)
+        self._ref_score = ref_score_counts / max(ref_score_counts.sum(), 1)
+
+        self._rows = np.arange(len(self.features))
+        self._lock = threading.Lock()
+        self.reset()
+
+    # -----------------------------
+    # Mise à jour (par requête)
+    # -----------------------------
+    def update(self, values, score):
+        """Ajoute une observation : valeurs des variables (ordre de `features`) et score."""
+        bins = self._bin_row(np.asarray(values, dtype=float))
+        score_bin = int(np.searchsorted(self._score_edges, score, side="right"))
+
+        with self._lock:
+            self._feature_counts[self._rows, bins] += 1
+            self._score_counts[score_bin] += 1
+            self._n += 1
+
+    def reset(self):
+        with self._lock:
+            self._feature_counts = np.zeros_like(self._ref_features, dtype=np.int64)
+            self._score_counts = np.zeros(N_SCORE_BINS, dtype=np.int64)
+            self._n = 0
+
+    # -----------------------------
+    # Rapport
+    # -----------------------------
+    def report(self):
+        """PSI et KS (sur histogrammes) du score et de chaque variable."""
+        with self._lock:
+            feature_counts = self._feature_counts.copy()
+            score_counts = self._score_counts.copy()
+            n = self._n
+
+        if n == 0:
+            return {"n_observations": 0, "min_observations": MIN_OBSERVATIONS, "score": None, "features": []}
+
+        cur_features = feature_counts / n
+        feature_psi = _psi(self._ref_features, cur_features)
+        feature_ks = _ks(self._ref_features, cur_features)
+
+        cur_score = score_counts / n
+        score_psi = float(_psi(self._ref_score, cur_score))
+        score_ks = float(_ks(self._ref_score, cur_score))
+
+        order = np.argsort(-feature_psi)
+        features = [
+            {
+                "feature": self.features[i],
+                "psi": round(float(feature_psi[i]), 4),
+                "ks": round(float(feature_ks[i]), 4),
+                "status": drift_status(feature_psi[i], n),
+            }
+            for i in order
+        ]
+
+        return {
+            "n_observations": n,
+            "min_observations": MIN_OBSERVATIONS,
+            "score": {
+                "psi": round(score_psi, 4),
+                "ks": round(score_ks, 4),
+                "status": drift_status(score_psi, n),
+            },
+            "features": features,
+        }
+
+    # -----------------------------
+    # Discrétisation
+    # -----------------------------
+    def _bin_row(self, row):
+        missing_bin = self._edges.shape[1] + 1
+        bins = (row[:, None] > self._edges).sum(axis=1)
+        return np.where(np.isnan(row), missing_bin, bins)
+
+    def _bin_matrix(self, matrix):
+        missing_bin = self._edges.shape[1] + 1
+        bins = (matrix[:, :, None] > self._edges[None, :, :]).sum(axis=2)
+        return np.where(np.isnan(matrix), missing_bin, bins)
+
+    def _proportions(self, bins):
+        n_rows, n_features = bins.shape
+        n_bins = self._edges.shape[1] + 2
+        counts = np.zeros((n_features, n_bins), dtype=np.int64)
+        np.add.at(counts, (np.broadcast_to(np.arange(n_features), bins.shape), bins), 1)
+        return counts / max(n_rows, 1)
+
+
+def _psi(expected, actual):
+    expected = np.clip(expected, PSI_EPSILON, None)
+    actual = np.clip(actual, PSI_EPSILON, None)
+    return ((actual - expected) * np.log(actual / expected)).sum(axis=-1)
+
+
+def _ks(expected, actual):
+    return np.abs(np.cumsum(actual, axis=-1) - np.cumsum(expected, axis=-1)).max(axis=-1)
+
+
+def drift_status(psi, n_observations):
+    if n_observations < MIN_OBSERVATIONS:
+        return "insuffisant"
+    if psi >= PSI_SIGNIFICANT:
+        return "significative"
+    if psi >= PSI_MODERATE:
+        return "modérée"
+    return "stable"
@@ -0,0 +1,92 @@
+# src/pages/drift_monitor.py
+import streamlit as st
+import pandas as pd
+import requests
+import plotly.express as px
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+API_DRIFT_URL = "https://new-p7-api.onrender.com/drift"
+
+STATUS_ICONS = {
+    "insuffisant": "⚪",
+    "stable": "🟢",
+    "modérée": "🟠",
+    "significative": "🔴",
+}
+
+st.set_page_config(
+    page_title="Dérive des données",
+    layout="wide",
+)
+
+st.title("📉 Surveillance de la dérive")
+st.markdown(
+    "Comparaison des clients scorés par l'API avec la population de référence "
+    "(PSI et KS calculés sur histogrammes)."
+)
+
+# ============================================================
+# APPEL À L'API
+# ============================================================
+
+try:
+    response = requests.get(API_DRIFT_URL, timeout=20)
+    response.raise_for_status()
+    report = response.json()
+except Exception as e:
+    st.error(f"❌ Erreur API : {e}")
+    st.stop()
+
+if report["n_observations"] == 0:
+    st.info("Aucune prédiction reçue depuis le démarrage de l'API.")
+    st.stop()
+
+# ============================================================
+# DÉRIVE DU SCORE
+# ============================================================
+
+score = report["score"]
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Prédictions observées", report["n_observations"])
+col2.metric("PSI du score", f"{score['psi']:.3f}")
+col3.metric("KS du score", f"{score['ks']:.3f}")
+
+if report["n_observations"] < report["min_observations"]:
+    st.warning(
+        f"Échantillon insuffisant ({report['n_observations']} / {report['min_observations']} "
+        "prédictions) : les indicateurs ne sont pas encore interprétables."
+    )
+
+st.markdown(f"Dérive du score : {STATUS_ICONS[score['status']]} **{score['status']}**")
+
+st.markdown("---")
+
+# ============================================================
+# DÉRIVE PAR VARIABLE
+# ============================================================
+
+st.subheader("📊 Variables les plus dérivantes")
+
+df_drift = pd.DataFrame(report["features"])
+
+top_n = st.slider("Nombre de variables affichées", 5, 50, 20)
+df_top = df_drift.head(top_n)
+
+fig = px.bar(
+    df_top,
+    x="psi",
+    y="feature",
+    color="status",
+    orientation="h",
+    color_discrete_map={"insuffisant": "lightgray", "stable": "green", "modérée": "orange", "significative": "darkred"},
+    labels={"psi": "PSI", "feature": "Variable", "status": "Dérive"},
+)
+fig.update_layout(yaxis={"categoryorder": "total ascending"})
+
+st.plotly_chart(fig, use_container_width=True)
+
+st.dataframe(df_drift, use_container_width=True, hide_index=True)
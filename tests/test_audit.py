@@ -0,0 +1,103 @@
+# tests/test_audit.py
+import json
+import threading
+import time
+
+from src.audit import AuditLog, query
+
+
+def test_audit_log_flush_and_query(tmp_path):
+    """Les décisions sont écrites à l'arrêt et retrouvées via l'index"""
+
+    audit = AuditLog(tmp_path, batch_size=2, max_bytes=200, fsync="always")
+    audit.start()
+    for client_id in (100002, 100003, 100002):
+        audit.record(client_id, 0.3, 0.54, "Approuvé", "abc")
+    audit.close()
+
+    stats = audit.stats()
+    assert stats["written"] == 3
+    assert stats["dropped"] == 0
+
+    entries = query(tmp_path, client_id=100002)
+    assert len(entries) == 2
+    assert all(e["model_fingerprint"] == "abc" for e in entries)
+
+    assert query(tmp_path, since=entries[-1]["ts"] + 1) == []
+
+
+def test_audit_log_buffer_full_counts_drops(tmp_path):
+    """Le tampon plein écrase les plus anciennes entrées et le signale"""
+
+    audit = AuditLog(tmp_path, buffer_size=2)
+    for client_id in (1, 2, 3):
+        audit.record(client_id, 0.9, 0.54, "Refusé", "abc")
+
+    stats = audit.stats()
+    assert stats["dropped"] == 1
+    assert stats["buffer_fill_ratio"] == 1.0
+
+
+def test_query_reads_unindexed_tail(tmp_path):
+    """Un lot écrit mais absent de l'index (arrêt brutal) est retrouvé"""
+
+    audit = AuditLog(tmp_path)
+    audit.start()
+    audit.record(100002, 0.3, 0.54, "Approuvé", "abc")
+    audit.close()
+
+    log_path = next(tmp_path.glob("decisions-*.jsonl"))
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"ts": 0.0, "client_id": 100003}) + "\n")
+
+    assert len(query(tmp_path)) == 2
+    assert query(tmp_path, client_id=100003) == [{"ts": 0.0, "client_id": 100003}]
+
+
+def test_close_timeout_keeps_writer(tmp_path, monkeypatch):
+    """Un arrêt qui dépasse le délai ne libère pas le thread d'écriture"""
+
+    release = threading.Event()
+    audit = AuditLog(tmp_path, batch_size=1)
+    monkeypatch.setattr(audit, "_write_batch", lambda batch: release.wait())
+    audit.start()
+    audit.record(100002, 0.3, 0.54, "Approuvé", "abc")
+
+    audit.close(timeout=0.05)
+    stats = audit.stats()
+    assert stats["close_timeouts"] == 1
+    assert stats["running"]
+
+    release.set()
+    audit.close()
+    assert not audit.stats()["running"]
+
+
+def test_writer_survives_write_error(tmp_path, monkeypatch):
+    """Après un échec d'ouverture de l'index, le lot suivant est bien écrit"""
+
+    failures = []
+
+    def flaky_open(path, *args, **kwargs):
+        if str(path).endswith(".idx") and not failures:
+            failures.append(path)
+            raise OSError("disque indisponible")
+        return open(path, *args, **kwargs)
+
+    monkeypatch.setattr("src.audit.open", flaky_open, raising=False)
+
+    audit = AuditLog(tmp_path, batch_size=1, flush_interval=0.01)
+    audit.start()
+    audit.record(100002, 0.3, 0.54, "Approuvé", "abc")
+    deadline = time.monotonic() + 5
+    while audit.stats()["write_errors"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    audit.record(100003, 0.9, 0.54, "Refusé", "abc")
+    audit.close()
+
+    stats = audit.stats()
+    assert stats["write_errors"] == 1
+    assert stats["dropped"] == 1
+    assert stats["written"] == 1
+    assert [e["client_id"] for e in query(tmp_path)] == [100003]
@@ -0,0 +1,45 @@
+# tests/test_drift.py
+import numpy as np
+
+from src.drift import DriftMonitor
+
+
+def test_drift_monitor_detects_shift():
+    """Une population identique reste stable, une population décalée dérive"""
+
+    rng = np.random.default_rng(0)
+    reference = rng.normal(size=(1000, 2))
+    reference_scores = rng.uniform(size=1000)
+
+    monitor = DriftMonitor(reference, ["A", "B"], reference_scores)
+    assert monitor.report()["n_observations"] == 0
+
+    for row, score in zip(reference, reference_scores):
+        monitor.update(row, score)
+    report = monitor.report()
+    assert report["score"]["status"] == "stable"
+    assert all(f["status"] == "stable" for f in report["features"])
+
+    monitor.reset()
+    for row in reference[:200]:
+        monitor.update(row + np.array([3.0, 0.0]), 0.95)
+    report = monitor.report()
+    assert report["features"][0]["feature"] == "A"
+    assert report["features"][0]["status"] == "significative"
+    assert report["score"]["status"] == "significative"
+
+
+def test_drift_monitor_small_sample_is_not_drift():
+    """Un petit échantillon tiré de la référence n'est pas signalé comme dérive"""
+
+    rng = np.random.default_rng(0)
+    reference = rng.normal(size=(1000, 2))
+    reference_scores = rng.uniform(size=1000)
+
+    monitor = DriftMonitor(reference, ["A", "B"], reference_scores)
+    for i in rng.choice(1000, size=30, replace=False):
+        monitor.update(reference[i], reference_scores[i])
+
+    report = monitor.report()
+    assert report["score"]["status"] == "insuffisant"
+    assert all(f["status"] == "insuffisant" for f in report["features"])